@@ -7,9 +7,11 @@ import os
 import sys
 import pygame
 from .utils import KeyTracker
+from .imgcache import load_image
 from .core.system import System
 from .core.field import Field
 from .core.talk import Talk
+from .core.models import PlayerState
 
 WIDTH, HEIGHT = 900, 700
 FPS = 60
@@ -49,15 +51,11 @@ class App:
         # --- タイトル画像 ---
         title_img_path = os.path.join(BASE_DIR, "img", "title.jpg")
         self.title_image = (
-            pygame.image.load(title_img_path).convert()
-            if os.path.isfile(title_img_path)
-            else None
+            load_image(title_img_path) if os.path.isfile(title_img_path) else None
         )
 
         # --- プレイヤー初期座標とインベントリ ---
-        self.x = 8
-        self.y = 8
-        self.items = []
+        self.player = PlayerState(8, 8)
         self.inventory_open = False
 
         # --- サブモジュール生成 ---
@@ -80,6 +78,27 @@ class App:
         self.sfx_inv_open = _load_sound("chestopen.mp3")
         self.sfx_inv_close = _load_sound("chestclose.mp3")
 
+    # --- プレイヤー状態へのショートカット ---
+    @property
+    def x(self):
+        return self.player.x
+
+    @x.setter
+    def x(self, value):
+        self.player.x = value
+
+    @property
+    def y(self):
+        return self.player.y
+
+    @y.setter
+    def y(self, value):
+        self.player.y = value
+
+    @property
+    def items(self):
+        return self.player.items
+
     def start_game(self):
         self.field.load_map("world")  # 初期マップ
         self.field.load_player()
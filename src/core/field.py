@@ -7,6 +7,9 @@ import pygame
 import os
 import math
 from ..utils import load_json  # JSON読み込み用
+from ..imgcache import load_image  # 変換済み画像キャッシュ
+from .models import TRANSITION_KINDS, load_maps, pack_pos
+from .triggers import TriggerIndex
 
 TILE = 16
 SCREEN_CENTER_X = 320
@@ -38,11 +41,18 @@ class Field:
 
         # --- マップデータの読み込み ---
         maps_path = os.path.join(self.BASE_DIR, "data", "maps.json")
-        self.map_data = load_json(maps_path) or {}
+        self.map_data = load_maps(load_json(maps_path) or {})
 
         self.current_map_id = None
-        self.current_walls = set()  # 高速検索用
-        self.current_exits = {}  # 高速検索用 {(x,y): data}
+        self.current_map = None  # MapData
+
+        # --- トリガー (出口・ドア・エリアなど) ---
+        self._trigger_indexes = {}  # {map_id: TriggerIndex}
+        self.trigger_index = TriggerIndex()
+        self.active_triggers = frozenset()  # 現在位置に重なっているトリガー
+        self.trigger_handlers = {}  # {kind: (on_enter, on_leave)}
+        self.add_trigger_handler("exit", on_enter=self._enter_exit)
+        self.add_trigger_handler("door", on_enter=self._enter_exit)
 
         # 初期マップロード (ID指定)
         self.load_map("world")
@@ -86,7 +96,7 @@ class Field:
             return
 
         # 2. 壁判定 (JSONから読み込んだデータ)
-        if (nx, ny) in self.current_walls:
+        if self.current_map.is_wall(nx, ny):
             """
             壁に衝突 by Issa
             jsonのwallsリストから座標を取得
@@ -97,12 +107,10 @@ class Field:
 
         # 3. NPC衝突判定
         # 現在のマップにいて、かつ移動先にいるNPCがいるか
-        for _, data in self.app.talk.dialogues.items():
-            if data.get("map_id") == self.current_map_id:
-                pos = data.get("position")
-                if pos and pos[0] == nx and pos[1] == ny:
-                    self._update_dir(dx, dy)
-                    return
+        npcs = self.app.talk.npcs_by_map.get(self.current_map_id, {})
+        if pack_pos(nx, ny) in npcs:
+            self._update_dir(dx, dy)
+            return
 
         # 移動開始
         self._update_dir(dx, dy)
@@ -141,15 +149,9 @@ class Field:
         screen.blit(self.player_image, self.player_rect)
 
         # NPC描画 (現在のマップにいるNPCのみ)
-        for _, data in self.app.talk.dialogues.items():
-            # マップIDチェック
-            if data.get("map_id") != self.current_map_id:
-                continue
-
-            pos = data.get("position")
-            if not pos or len(pos) < 2:
-                continue
-            nx, ny = pos[0], pos[1]
+        npcs = self.app.talk.npcs_by_map.get(self.current_map_id, {})
+        for npc in npcs.values():
+            nx, ny = npc.x, npc.y
             screen_x = SCREEN_CENTER_X + (nx - self.app.x) * TILE + ox
             screen_y = SCREEN_CENTER_Y + (ny - self.app.y) * TILE + oy
 
@@ -157,7 +159,7 @@ class Field:
             pygame.draw.rect(
                 screen, (200, 120, 80), (screen_x, screen_y, npc_size, npc_size)
             )
-            lines = data.get("lines", [""])
+            lines = npc.lines
             if lines:
                 label_surf = self.app.font.render(lines[0][:12], True, (255, 255, 255))
                 screen.blit(label_surf, (screen_x, screen_y - 18))
@@ -187,23 +189,71 @@ class Field:
         screen.blit(surf, (8, 8))
         # ----------------------------------
 
+    def add_trigger_handler(self, kind, on_enter=None, on_leave=None):
+        """
+        トリガー種別ごとの処理を登録
+        on_enter / on_leave: trigger を引数に取る関数
+        """
+        self.trigger_handlers[kind] = (on_enter, on_leave)
+
     def _check_map_event(self):
         """
-        現在の座標が出口リストにあるか確認 by Issa
-        座標をキーにする
-        current_posは毎回プレイヤーの座標を確認
-        if文でmaps.jsonのexitsリストを確認
-        もし座標が一致すれば_start_transition関数を呼び出し、マップ遷移を開始
+        移動後の座標で入った・出たトリガーを調べて処理を呼ぶ
+        トリガーはグリッド索引から引くので、マップ内の全トリガーは走査しない
         """
-        current_pos = (self.app.x, self.app.y)
-        if current_pos in self.current_exits:
-            exit_data = self.current_exits[current_pos]
-            # 遷移開始
-            self._start_transition(
-                exit_data["target_map"],
-                exit_data.get("dest_x"),
-                exit_data.get("dest_y"),
-            )
+        self.active_triggers, entered, left = self.trigger_index.step(
+            self.active_triggers, self.app.x, self.app.y
+        )
+        for trigger in left:
+            self._call_leave(trigger)
+        # 遷移しないトリガーを先にすべて処理し、出口・ドアは最後に 1 つだけ処理
+        for trigger in entered:
+            if trigger.kind not in TRANSITION_KINDS:
+                self._call_enter(trigger)
+        for trigger in entered:
+            if trigger.kind in TRANSITION_KINDS:
+                self._call_enter(trigger)
+                if self.transitioning:
+                    break
+
+    def _call_enter(self, trigger):
+        on_enter = self.trigger_handlers.get(trigger.kind, (None, None))[0]
+        if on_enter:
+            on_enter(trigger)
+
+    def _call_leave(self, trigger):
+        on_leave = self.trigger_handlers.get(trigger.kind, (None, None))[1]
+        if on_leave:
+            on_leave(trigger)
+
+    def _enter_exit(self, trigger):
+        """
+        出口・ドアに入ったらマップ遷移を開始 by Issa
+        """
+        exit_data = trigger.data
+        self._start_transition(
+            exit_data.target_map,
+            exit_data.dest_x,
+            exit_data.dest_y,
+        )
+
+    def _leave_triggers(self):
+        """
+        マップ切り替え前に、現在重なっているトリガーすべてから出る
+        """
+        for trigger in self.active_triggers:
+            self._call_leave(trigger)
+        self.active_triggers = frozenset()
+
+    def _arrive_triggers(self):
+        """
+        マップ切り替え後に、現在位置のトリガーに入る
+        出口・ドアは遷移先ですぐ反応しないように入った扱いにしない
+        """
+        self.active_triggers = self.trigger_index.at(self.app.x, self.app.y)
+        for trigger in self.active_triggers:
+            if trigger.kind not in TRANSITION_KINDS:
+                self._call_enter(trigger)
 
     def _start_transition(self, map_id, dest_x, dest_y):
         self.transitioning = True
@@ -216,10 +266,10 @@ class Field:
         if self._transition_stage == "out":
             self.transition_radius -= self.transition_speed
             if self.transition_radius <= 0:
-                # 暗転中にマップ切り替え
-                self.load_map(self.transition_target_map_id)
-                if self.transition_dest_pos:
+                # 暗転中にマップ切り替え (到着地点のトリガー判定のため先に座標を移す)
+                if None not in self.transition_dest_pos:
                     self.app.x, self.app.y = self.transition_dest_pos
+                self.load_map(self.transition_target_map_id)
 
                 self.transition_radius = 0
                 self._transition_stage = "in"
@@ -238,15 +288,17 @@ class Field:
             print(f"Map ID not found: {map_id}")
             return
 
+        self._leave_triggers()
         self.current_map_id = map_id
         data = self.map_data[map_id]
+        self.current_map = data
 
         # 画像ロード
-        img_name = data.get("image", "world_map.png")
+        img_name = data.image
         path = os.path.join(self.BASE_DIR, "img", img_name)
 
         if os.path.isfile(path):
-            self.map_image = pygame.image.load(path).convert()
+            self.map_image = load_image(path)
             w, h = self.map_image.get_size()
             self.map_w = w // TILE
             self.map_h = h // TILE
@@ -255,19 +307,16 @@ class Field:
             self.map_w = 0
             self.map_h = 0
 
-        # 壁データの展開 (Setにして高速化)
-        self.current_walls = set()
-        for w in data.get("walls", []):
-            self.current_walls.add(tuple(w))
-
-        # 出口データの展開 (Dictにして高速化)
-        self.current_exits = {}
-        for e in data.get("exits", []):
-            key = (e["x"], e["y"])
-            self.current_exits[key] = e
+        # --- トリガー索引 (マップごとに 1 度だけ構築) ---
+        index = self._trigger_indexes.get(map_id)
+        if index is None:
+            index = TriggerIndex(data.triggers)
+            self._trigger_indexes[map_id] = index
+        self.trigger_index = index
+        self._arrive_triggers()
 
         # --- BGM再生 ---
-        bgm_file = data.get("bgm", "")
+        bgm_file = data.bgm
         if bgm_file:
             bgm_path = os.path.join(self.BASE_DIR, "sounds", bgm_file)
             if os.path.isfile(bgm_path):
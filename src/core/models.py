@@ -0,0 +1,229 @@
+"""
+ゲームデータモデル | src/core/models.py
+maps.json / dialogues.json / セーブデータを __slots__ 付きの軽量レコードに変換
+"""
+
+POS_MIN = -0x8000
+POS_MAX = 0x7FFF
+
+
+def pos_in_range(x, y):
+    """pack_pos で扱える座標か"""
+    return POS_MIN <= x <= POS_MAX and POS_MIN <= y <= POS_MAX
+
+
+def pack_pos(x, y):
+    """
+    タイル座標 (x, y) を 1 つの int にまとめる
+    タプルより小さく、set / dict のキーとしてそのまま使える
+    x, y はそれぞれ POS_MIN〜POS_MAX (範囲外は ValueError)
+    """
+    if not pos_in_range(x, y):
+        raise ValueError(f"座標が範囲外です: ({x}, {y})")
+    return ((y - POS_MIN) << 16) | (x - POS_MIN)
+
+
+# マップ遷移を起こすトリガーの種別
+TRANSITION_KINDS = ("exit", "door")
+
+
+class Exit:
+    """マップ出口 (1 タイル)"""
+
+    __slots__ = ("x", "y", "target_map", "dest_x", "dest_y")
+
+    def __init__(self, x, y, target_map, dest_x=None, dest_y=None):
+        self.x = x
+        self.y = y
+        self.target_map = target_map
+        self.dest_x = dest_x
+        self.dest_y = dest_y
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d["x"], d["y"], d["target_map"], d.get("dest_x"), d.get("dest_y"))
+
+
+class Trigger:
+    """
+    マップ上の矩形トリガー (出口・ドア・エリア・エンカウント領域など)
+    kind: "exit", "door", "zone", "encounter" など
+    data: exit / door は Exit、それ以外は maps.json の dict
+    """
+
+    __slots__ = ("kind", "x", "y", "w", "h", "data")
+
+    def __init__(self, kind, x, y, w, h, data):
+        self.kind = kind
+        self.x = x
+        self.y = y
+        self.w = w
+        self.h = h
+        self.data = data
+
+    @classmethod
+    def from_dict(cls, d):
+        kind = d.get("type", "zone")
+        data = Exit.from_dict(d) if kind in TRANSITION_KINDS else d
+        return cls(kind, d["x"], d["y"], d.get("w", 1), d.get("h", 1), data)
+
+    def contains(self, x, y):
+        return self.x <= x < self.x + self.w and self.y <= y < self.y + self.h
+
+
+class MapData:
+    """
+    マップ 1 枚分のデータ
+    walls: 壁座標を pack_pos した frozenset
+    triggers: 出口 (1x1 の "exit") を含むすべての Trigger
+    """
+
+    __slots__ = ("map_id", "image", "walls", "triggers", "bgm")
+
+    def __init__(self, map_id, image, walls, triggers, bgm=""):
+        self.map_id = map_id
+        self.image = image
+        self.walls = walls
+        self.triggers = triggers
+        self.bgm = bgm
+
+    @classmethod
+    def from_dict(cls, map_id, d):
+        walls = frozenset(pack_pos(w[0], w[1]) for w in d.get("walls", []))
+        triggers = []
+        for e in d.get("exits", []):
+            ex = Exit.from_dict(e)
+            triggers.append(Trigger("exit", ex.x, ex.y, 1, 1, ex))
+        for t in d.get("triggers", []):
+            triggers.append(Trigger.from_dict(t))
+        return cls(
+            map_id,
+            d.get("image", "world_map.png"),
+            walls,
+            tuple(triggers),
+            d.get("bgm", ""),
+        )
+
+    def is_wall(self, x, y):
+        return pos_in_range(x, y) and pack_pos(x, y) in self.walls
+
+
+class Quiz:
+    """NPC が出題するクイズ"""
+
+    __slots__ = ("question", "choices", "answer", "reward")
+
+    def __init__(self, question, choices, answer=0, reward=None):
+        self.question = question
+        self.choices = choices
+        self.answer = answer
+        self.reward = reward
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(
+            d.get("question", ""),
+            tuple(d.get("choices", ())),
+            d.get("answer", 0),
+            d.get("reward"),
+        )
+
+
+class Npc:
+    """
+    NPC 1 体分のデータ
+    position を持たない NPC は x, y が None
+    """
+
+    __slots__ = ("npc_id", "map_id", "x", "y", "lines", "quiz")
+
+    def __init__(self, npc_id, map_id, x, y, lines, quiz=None):
+        self.npc_id = npc_id
+        self.map_id = map_id
+        self.x = x
+        self.y = y
+        self.lines = lines
+        self.quiz = quiz
+
+    @classmethod
+    def from_dict(cls, npc_id, d):
+        pos = d.get("position")
+        x, y = (pos[0], pos[1]) if pos and len(pos) >= 2 else (None, None)
+        quiz = d.get("quiz")
+        return cls(
+            npc_id,
+            d.get("map_id"),
+            x,
+            y,
+            tuple(d.get("lines", ())),
+            Quiz.from_dict(quiz) if quiz else None,
+        )
+
+
+class Inventory:
+    """
+    所持アイテム
+    所持判定は set、表示・保存は取得順のリストで行う
+    """
+
+    __slots__ = ("_set", "_order")
+
+    def __init__(self, items=()):
+        self._set = set()
+        self._order = []
+        for item in items:
+            self.add(item)
+
+    def add(self, item):
+        """未所持なら追加して True を返す"""
+        if item in self._set:
+            return False
+        self._set.add(item)
+        self._order.append(item)
+        return True
+
+    def __contains__(self, item):
+        return item in self._set
+
+    def __iter__(self):
+        return iter(self._order)
+
+    def __len__(self):
+        return len(self._order)
+
+    def to_list(self):
+        return list(self._order)
+
+
+class PlayerState:
+    """プレイヤーの座標と所持アイテム"""
+
+    __slots__ = ("x", "y", "items")
+
+    def __init__(self, x, y, items=()):
+        self.x = x
+        self.y = y
+        self.items = Inventory(items)
+
+    def to_dict(self):
+        return {"x": self.x, "y": self.y, "items": self.items.to_list()}
+
+
+def load_maps(raw):
+    """maps.json の dict から {map_id: MapData} を作る"""
+    return {map_id: MapData.from_dict(map_id, d) for map_id, d in raw.items()}
+
+
+def load_npcs(raw):
+    """dialogues.json の dict から {npc_id: Npc} を作る"""
+    return {npc_id: Npc.from_dict(npc_id, d) for npc_id, d in raw.items()}
+
+
+def index_npcs(npcs):
+    """{map_id: {pack_pos(x, y): Npc}} の位置索引を作る"""
+    index = {}
+    for npc in npcs.values():
+        if npc.x is None:
+            continue
+        index.setdefault(npc.map_id, {})[pack_pos(npc.x, npc.y)] = npc
+    return index
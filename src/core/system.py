@@ -6,6 +6,7 @@
 from ..utils import save_json, load_json, SAVEFILE
 import pygame
 import os
+from .models import PlayerState
 
 
 class System:
@@ -14,16 +15,17 @@ class System:
         self.savefile = SAVEFILE
 
     def save(self):
-        data = {"x": self.app.x, "y": self.app.y, "items": self.app.items}
-        save_json(self.savefile, data)
+        save_json(self.savefile, self.app.player.to_dict())
         print("Saved:", self.savefile)
 
     def load(self):
         data = load_json(self.savefile)
         if data:
-            self.app.x = data.get("x", self.app.x)
-            self.app.y = data.get("y", self.app.y)
-            self.app.items = data.get("items", [])
+            self.app.player = PlayerState(
+                data.get("x", self.app.x),
+                data.get("y", self.app.y),
+                data.get("items", []),
+            )
             print("Loaded save:", self.savefile)
             return True
         return False
@@ -5,8 +5,12 @@ dialogues.json を読み込み、Z で進行、Q で離脱、矢印で選択、
 """
 
 import os
-from ..ui import draw_window
+from ..ui import draw_window, draw_text_window, text_area
+from ..textlayout import layout_text
 from ..utils import load_json
+from .models import load_npcs, index_npcs, pack_pos, pos_in_range
+
+TYPE_SPEED = 1  # タイプライター表示で 1 フレームに進める文字数
 
 
 class Talk:
@@ -23,10 +27,14 @@ class Talk:
             os.path.join(os.path.dirname(__file__), "..", "..", "assets")
         )
         dialogues_path = os.path.join(BASE_DIR, "dialogues", "dialogues.json")
-        self.dialogues = load_json(dialogues_path) or {}
+        self.dialogues = load_npcs(load_json(dialogues_path) or {})
+        self.npcs_by_map = index_npcs(self.dialogues)  # {map_id: {pos: Npc}}
         self.active = None
         self.window_lines = []
         self.line_index = 0
+        self.page_index = 0  # 折り返し後のページ番号
+        self.typewriter = True  # 1 文字ずつ表示するか
+        self.reveal = 0  # タイプライター表示済みの文字数
         self.current_quiz = None
         self.quiz_mode = False
         self.quiz_choice = 0
@@ -39,6 +47,8 @@ class Talk:
         """
         if not (self.window_lines or self.quiz_mode or self.current_quiz):
             return
+        if self.window_lines:
+            self.reveal += TYPE_SPEED
         if self.wait_frames > 0:
             self.wait_frames -= 1
             return
@@ -56,6 +66,16 @@ class Talk:
 
         # --- 通常会話モード ---
         if keys.get("z"):
+            layout = self._layout()
+            if self._revealing(layout):
+                # 表示途中なら全文を表示
+                self.reveal = layout.page_length(self.page_index)
+                return
+            self.reveal = 0
+            self.page_index += 1
+            if self.page_index < layout.page_count():
+                return
+            self.page_index = 0
             self.line_index += 1
             if self.line_index < len(self.window_lines):
                 pass
@@ -79,8 +99,8 @@ class Talk:
         # --- クイズ描画優先 ---
         if self.quiz_mode and self.current_quiz:
             q = self.current_quiz
-            lines = [q.get("question", "")]
-            for i, c in enumerate(q.get("choices", [])):
+            lines = [q.question]
+            for i, c in enumerate(q.choices):
                 prefix = ">" if i == self.quiz_choice else " "
                 lines.append(f"{prefix} {i + 1}. {c}")
             draw_window(screen, font, lines)
@@ -88,36 +108,58 @@ class Talk:
 
         # --- 通常会話描画 ---
         if self.window_lines:
-            idx = min(self.line_index, max(0, len(self.window_lines) - 1))
-            lines = [self.window_lines[idx]]
-            draw_window(screen, font, lines)
+            layout = self._layout(font)
+            reveal = self.reveal if self._revealing(layout) else None
+            draw_text_window(screen, layout, self.page_index, reveal)
 
     def try_talk(self):
         """
         プレイヤー位置の四近傍にいるNPCを探索して会話開始
         """
         px, py = self.app.x, self.app.y
-        for key, data in self.dialogues.items():
-            pos = data.get("position")
-            if pos:
-                nx, ny = pos[0], pos[1]
-                if abs(nx - px) + abs(ny - py) == 1:  # 四近傍判定
-                    self.active = key
-                    self.open_dialog(data)
-                    return
+        npcs = self.npcs_by_map.get(self.app.field.current_map_id, {})
+        for nx, ny in ((px, py - 1), (px, py + 1), (px - 1, py), (px + 1, py)):
+            npc = npcs.get(pack_pos(nx, ny)) if pos_in_range(nx, ny) else None
+            if npc:
+                self.active = npc.npc_id
+                self.open_dialog(npc)
+                return
 
     def open_dialog(self, data):
         """
         会話開始処理
-        data: NPCデータ（lines, quizなど）
+        data: Npc（lines, quizなど）
         """
-        self.window_lines = data.get("lines", [])
-        self.line_index = 0
-        self.current_quiz = data.get("quiz")
+        self._show(data.lines)
+        self.current_quiz = data.quiz
         self.quiz_mode = False
         self.quiz_choice = 0
         self.wait_frames = 10  # 押しっぱなし防止の待機フレーム
 
+    def _show(self, lines):
+        """
+        ウィンドウに表示するメッセージを差し替えて先頭から表示
+        """
+        self.window_lines = list(lines)
+        self.line_index = 0
+        self.page_index = 0
+        self.reveal = 0
+
+    def _layout(self, font=None):
+        """
+        表示中メッセージのレイアウト (キャッシュ済み)
+        """
+        idx = min(self.line_index, max(0, len(self.window_lines) - 1))
+        width, height = text_area()
+        font = font or self.app.font
+        return layout_text(self.window_lines[idx], font, width, height)
+
+    def _revealing(self, layout):
+        """
+        タイプライター表示の途中かどうか
+        """
+        return self.typewriter and self.reveal < layout.page_length(self.page_index)
+
     def is_active(self):
         """
         会話中かどうか
@@ -131,19 +173,19 @@ class Talk:
         """
         q = self.current_quiz
         if keys.get("up"):
-            self.quiz_choice = (self.quiz_choice - 1) % len(q["choices"])
+            self.quiz_choice = (self.quiz_choice - 1) % len(q.choices)
         elif keys.get("down"):
-            self.quiz_choice = (self.quiz_choice + 1) % len(q["choices"])
+            self.quiz_choice = (self.quiz_choice + 1) % len(q.choices)
         elif keys.get("z"):
             # 決定
-            correct = q.get("answer", 0)
+            correct = q.answer
             if self.quiz_choice == correct:
-                reward = q.get("reward")
-                if reward and reward not in self.app.items:
-                    self.app.items.append(reward)
-                self.window_lines = ["Correct!", f"Reward: {reward}"]
+                reward = q.reward
+                if reward:
+                    self.app.items.add(reward)
+                self._show(["Correct!", f"Reward: {reward}"])
             else:
-                self.window_lines = ["Wrong.", f"Answer: {q['choices'][correct]}"]
+                self._show(["Wrong.", f"Answer: {q.choices[correct]}"])
             # クイズ終了
             self.current_quiz = None
             self.quiz_mode = False
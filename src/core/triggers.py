@@ -0,0 +1,52 @@
+"""
+トリガー空間索引 | src/core/triggers.py
+マップ上の矩形トリガーを一様グリッドに登録し、
+1 歩ごとに「入った」「出た」トリガーを全件走査せずに求める
+"""
+
+from .models import pack_pos
+
+CELL = 16  # グリッド 1 セルあたりのタイル数
+
+_EMPTY = frozenset()
+
+
+class TriggerIndex:
+    """
+    一様グリッドによるトリガー索引
+    各セルには、そのセルと重なるトリガーのリストを持つ
+    """
+
+    __slots__ = ("cells",)
+
+    def __init__(self, triggers=()):
+        self.cells = {}
+        for t in triggers:
+            self.add(t)
+
+    def add(self, trigger):
+        cx0, cy0 = trigger.x // CELL, trigger.y // CELL
+        cx1 = (trigger.x + trigger.w - 1) // CELL
+        cy1 = (trigger.y + trigger.h - 1) // CELL
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                self.cells.setdefault(pack_pos(cx, cy), []).append(trigger)
+
+    def at(self, x, y):
+        """タイル (x, y) を含むトリガーの frozenset"""
+        if x < 0 or y < 0:
+            return _EMPTY
+        cell = self.cells.get(pack_pos(x // CELL, y // CELL))
+        if not cell:
+            return _EMPTY
+        return frozenset(t for t in cell if t.contains(x, y))
+
+    def step(self, prev, x, y):
+        """
+        直前にいたトリガー集合 prev から (x, y) に移動したときの
+        (現在のトリガー集合, 入ったトリガー, 出たトリガー) を返す
+        """
+        cur = self.at(x, y)
+        if cur is prev or (not cur and not prev):
+            return cur, _EMPTY, _EMPTY
+        return cur, cur - prev, prev - cur
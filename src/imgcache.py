@@ -0,0 +1,124 @@
+"""
+変換済み画像キャッシュ | imgcache.py
+
+PNG などを毎回デコードせず、ディスプレイのピクセル形式に変換済みの
+生ピクセルをディスクに保存し、次回以降は mmap + frombuffer で読み込む
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import pygame
+
+CACHE_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", ".cache", "img")
+)
+
+# ヘッダ: マジック, 元ファイルの sha256, 幅, 高さ, frombuffer 形式
+_MAGIC = b"PBLIMG1\0"
+_HEADER = struct.Struct("<8s32sII8s")
+_HEADER_SIZE = 64  # ピクセル先頭を揃えるためヘッダは 64 バイト固定
+
+# (バイト数, Rマスク, Gマスク, Bマスク) -> frombuffer 形式 (リトルエンディアン)
+_FORMATS = {
+    (4, 0xFF0000, 0x00FF00, 0x0000FF): "BGRA",
+    (4, 0x0000FF, 0x00FF00, 0xFF0000): "RGBX",
+    (3, 0x0000FF, 0x00FF00, 0xFF0000): "RGB",
+}
+
+# プロセス内キャッシュ {path: Surface}
+_surfaces = {}
+
+
+def load_image(path):
+    """
+    ディスプレイ形式に変換済みの Surface を返す
+    同じプロセス内では同じ Surface を使い回し、
+    ディスクキャッシュが元画像と一致すればデコードせずに mmap で読み込む
+    """
+    surf = _surfaces.get(path)
+    if surf is None:
+        surf = _load(path)
+        _surfaces[path] = surf
+    return surf
+
+
+def _load(path):
+    fmt = _display_format()
+    if fmt is None:
+        # 対応していないピクセル形式ではキャッシュせず通常ロード
+        return pygame.image.load(path).convert()
+
+    digest = _file_digest(path)
+    # 元画像ごとに 1 ファイル (画像が変わったらヘッダの sha256 で検出して上書き)
+    name = hashlib.sha256(os.path.abspath(path).encode("utf-8")).hexdigest()
+    cache_path = os.path.join(CACHE_DIR, name + ".raw")
+    surf = _load_cache(cache_path, digest, fmt)
+    if surf is None:
+        surf = pygame.image.load(path).convert()
+        try:
+            _write_cache(cache_path, digest, fmt, surf)
+        except OSError as e:
+            print("画像キャッシュ書き込みエラー:", e)
+    return surf
+
+
+def _display_format():
+    """ディスプレイのピクセル形式に対応する frombuffer 形式 (なければ None)"""
+    if sys.byteorder != "little":
+        return None
+    display = pygame.display.get_surface()
+    if display is None:
+        return None
+    r, g, b, _ = display.get_masks()
+    return _FORMATS.get((display.get_bytesize(), r, g, b))
+
+
+def _file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.digest()
+
+
+def _load_cache(cache_path, digest, fmt):
+    """
+    キャッシュが有効なら mmap 上のピクセルを直接参照する Surface を返す
+    ハッシュ・形式・サイズのいずれかが一致しなければ None
+    """
+    try:
+        with open(cache_path, "rb") as f:
+            # ACCESS_COPY: 読み込みはページ単位の遅延マップ、書き込みはプロセス内のみ
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    except (OSError, ValueError):
+        return None
+
+    if len(mm) < _HEADER_SIZE:
+        return None
+    magic, cached_digest, w, h, cached_fmt = _HEADER.unpack_from(mm, 0)
+    cached_fmt = cached_fmt.rstrip(b"\0").decode("ascii", "replace")
+    if magic != _MAGIC or cached_digest != digest or cached_fmt != fmt:
+        return None
+    if len(mm) != _HEADER_SIZE + w * h * len(fmt):
+        return None
+
+    # frombuffer はバッファへの参照を保持するため mmap は Surface と同じ寿命になる
+    surf = pygame.image.frombuffer(memoryview(mm)[_HEADER_SIZE:], (w, h), fmt)
+    if fmt == "BGRA":
+        # XRGB の表示形式を BGRA で読むため、アルファ値は無視してそのまま転送する
+        surf.set_alpha(None)
+    return surf
+
+
+def _write_cache(cache_path, digest, fmt, surf):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    w, h = surf.get_size()
+    header = _HEADER.pack(_MAGIC, digest, w, h, fmt.encode("ascii"))
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header.ljust(_HEADER_SIZE, b"\0"))
+        f.write(pygame.image.tobytes(surf, fmt))
+    os.replace(tmp_path, cache_path)
@@ -0,0 +1,112 @@
+"""
+メモリ使用量レポート | memreport.py
+
+合成データで NPC / マップ / 壁 1 件あたりの常駐バイト数を tracemalloc で計測する
+予算を超えた項目があれば終了コード 1 を返す (メモリ回帰チェック用)
+
+実行方法: python -m src.memreport
+"""
+
+import sys
+import tracemalloc
+from .core.models import load_maps, load_npcs, index_npcs
+
+SIZES = (10, 100, 1_000, 10_000, 100_000)
+
+# 1 件あたりの上限バイト数 (最大サイズでの計測値に対して判定)
+BUDGETS = {
+    "npc": 450,
+    "map": 800,
+    "wall": 100,
+}
+
+
+def _raw_npcs(n):
+    return {
+        f"npc_{i}": {
+            "position": [i % 1000, i // 1000],
+            "map_id": f"map_{i % 10}",
+            "lines": [f"line {i}", "こんにちは"],
+            "quiz": {
+                "question": f"q{i}",
+                "choices": ["A", "B", "C"],
+                "answer": 0,
+                "reward": f"item_{i}",
+            },
+        }
+        for i in range(n)
+    }
+
+
+def _raw_maps(n):
+    return {
+        f"map_{i}": {
+            "image": "world_map.png",
+            "walls": [],
+            "exits": [
+                {"x": 1, "y": 1, "target_map": "map_0", "dest_x": 2, "dest_y": 2}
+            ],
+            "bgm": "",
+        }
+        for i in range(n)
+    }
+
+
+def _raw_walls(n):
+    return {
+        "world": {
+            "image": "world_map.png",
+            "walls": [[i % 1000, i // 1000] for i in range(n)],
+            "exits": [],
+        }
+    }
+
+
+def _measure(build, raw):
+    """raw を構築済みにしてから build(raw) が確保したバイト数を返す"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build(raw)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def _build_npcs(raw):
+    npcs = load_npcs(raw)
+    return npcs, index_npcs(npcs)
+
+
+def _measure_walls(raw):
+    # 壁 0 件のマップとの差分を壁の分とする
+    empty = _measure(load_maps, _raw_walls(0))
+    return _measure(load_maps, raw) - empty
+
+
+CASES = (
+    ("npc", _raw_npcs, lambda raw: _measure(_build_npcs, raw)),
+    ("map", _raw_maps, lambda raw: _measure(load_maps, raw)),
+    ("wall", _raw_walls, _measure_walls),
+)
+
+
+def main():
+    failed = []
+    print(f"{'kind':<6}" + "".join(f"{n:>10}" for n in SIZES) + "   (bytes/entity)")
+    for kind, make_raw, measure in CASES:
+        per_entity = []
+        for n in SIZES:
+            per_entity.append(measure(make_raw(n)) / n)
+        print(f"{kind:<6}" + "".join(f"{b:>10.1f}" for b in per_entity))
+        if per_entity[-1] > BUDGETS[kind]:
+            failed.append(kind)
+
+    if failed:
+        print("メモリ予算超過:", ", ".join(failed))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""
+テキストレイアウト | textlayout.py
+
+フォントの字送り幅を使って日本語・英語混在テキストを折り返し、
+禁則処理を行ってウィンドウの高さごとにページ分割する
+レイアウト結果 (行ごとの描画済み Surface) は (text, font, 幅, 高さ, 色) ごとにキャッシュ
+"""
+
+from collections import OrderedDict
+
+# 行頭禁則文字 (前の文字と一緒に扱う)
+NO_LINE_START = set(
+    "、。，．・：；？！゛゜ヽヾゝゞ々ー）］｝」』〕〉》】〙〗〟’”｠»"
+    "ぁぃぅぇぉっゃゅょゎゕゖァィゥェォッャュョヮヵヶ…‥"
+    "!%),.:;?]}"
+)
+# 行末禁則文字 (次の文字と一緒に扱う)
+NO_LINE_END = set("（［｛「『〔〈《【〘〖〝‘“｟«([{")
+
+CACHE_SIZE = 256
+
+_cache = OrderedDict()
+
+
+def _is_cjk(ch):
+    c = ord(ch)
+    return (
+        0x2E80 <= c <= 0x9FFF  # CJK 記号・かな・漢字
+        or 0xAC00 <= c <= 0xD7AF  # ハングル
+        or 0xF900 <= c <= 0xFAFF  # CJK 互換漢字
+        or 0xFF00 <= c <= 0xFFEF  # 全角英数・半角カナ
+        or c >= 0x20000
+    )
+
+
+def _advances(text, font):
+    """1 文字ごとの字送り幅"""
+    metrics = font.metrics(text) or []
+    result = []
+    for ch, m in zip(text, metrics):
+        result.append(m[4] if m else font.size(ch)[0])
+    return result
+
+
+def _tokenize(text):
+    """
+    折り返し可能な位置で区切ったトークン列 [(start, end), ...] を返す
+    - 英単語 (空白以外の非 CJK 文字の連続) は 1 トークン
+    - CJK 文字は 1 文字 1 トークン
+    - 空白の連続は 1 トークン
+    - 行頭禁則文字は前のトークンに、行末禁則文字は次のトークンに連結
+    """
+    tokens = []
+    i, n = 0, len(text)
+    while i < n:
+        ch = text[i]
+        j = i + 1
+        if ch.isspace():
+            while j < n and text[j].isspace():
+                j += 1
+        elif not _is_cjk(ch):
+            while j < n and not text[j].isspace() and not _is_cjk(text[j]):
+                j += 1
+        tokens.append([i, j])
+        i = j
+
+    merged = []
+    for tok in tokens:
+        ch = text[tok[0]]
+        if merged and ch in NO_LINE_START and not text[merged[-1][1] - 1].isspace():
+            merged[-1][1] = tok[1]
+        elif merged and text[merged[-1][1] - 1] in NO_LINE_END:
+            merged[-1][1] = tok[1]
+        else:
+            merged.append(tok)
+    return merged
+
+
+def wrap_text(text, font, width):
+    """
+    text を幅 width (px) に収まるように折り返した行のリストを返す
+    改行文字は強制改行として扱う
+    """
+    lines = []
+    for para in text.split("\n"):
+        lines.extend(_wrap_paragraph(para, font, width))
+    return lines
+
+
+def _wrap_paragraph(text, font, width):
+    if not text:
+        return [""]
+    adv = _advances(text, font)
+    lines = []
+    start = None  # 現在行の先頭インデックス
+    end = 0
+    line_w = 0
+    for tok_start, tok_end in _tokenize(text):
+        if text[tok_start].isspace():
+            # 空白は行頭に置かず、行末なら捨てる
+            if start is not None:
+                line_w += sum(adv[tok_start:tok_end])
+                end = tok_end
+            continue
+
+        tok_w = sum(adv[tok_start:tok_end])
+        if start is not None and line_w + tok_w > width:
+            lines.append(text[start:end].rstrip())
+            start = None
+        if start is None:
+            start, line_w = tok_start, 0
+
+        if tok_w > width:
+            # 1 トークンで幅を超える場合は文字単位で強制改行
+            for k in range(tok_start, tok_end):
+                if line_w + adv[k] > width and k > start:
+                    lines.append(text[start:k])
+                    start, line_w = k, 0
+                line_w += adv[k]
+        else:
+            line_w += tok_w
+        end = tok_end
+
+    if start is not None:
+        lines.append(text[start:end].rstrip())
+    return lines or [""]
+
+
+class TextLayout:
+    """
+    ページ分割済みのテキスト
+    pages: [[(Surface, 累積字送り幅のリスト), ...], ...]
+    """
+
+    __slots__ = ("pages", "line_height")
+
+    def __init__(self, pages, line_height):
+        self.pages = pages
+        self.line_height = line_height
+
+    def page_count(self):
+        return len(self.pages)
+
+    def page_length(self, page):
+        """ページ内の文字数 (タイプライター表示の終端判定用)"""
+        return sum(len(cum) - 1 for _, cum in self.pages[page])
+
+    def draw(self, surface, pos, page, reveal=None):
+        """
+        page 番目のページを pos に描画
+        reveal: 表示する文字数 (None なら全文)
+                描画済みの行 Surface を切り出して表示するので再レンダリングしない
+        """
+        x, y = pos
+        for i, (surf, cum) in enumerate(self.pages[page]):
+            n = len(cum) - 1
+            if reveal is None or reveal >= n:
+                surface.blit(surf, (x, y + i * self.line_height))
+            else:
+                if reveal > 0:
+                    area = (0, 0, cum[reveal], surf.get_height())
+                    surface.blit(surf, (x, y + i * self.line_height), area)
+                return
+            if reveal is not None:
+                reveal -= n
+
+
+def layout_text(text, font, width, height, fg=(255, 255, 255)):
+    """
+    text を幅 width, 高さ height の領域向けにレイアウトした TextLayout を返す
+    同じ引数での呼び出しはキャッシュから返す
+    """
+    key = (text, font, width, height, fg)
+    layout = _cache.get(key)
+    if layout is not None:
+        _cache.move_to_end(key)
+        return layout
+
+    line_h = font.get_linesize()
+    per_page = max(1, height // line_h)
+    rendered = []
+    for line in wrap_text(text, font, width):
+        cum = [0]
+        for a in _advances(line, font):
+            cum.append(cum[-1] + a)
+        rendered.append((font.render(line, True, fg), cum))
+    pages = [rendered[i : i + per_page] for i in range(0, len(rendered), per_page)]
+    layout = TextLayout(pages or [[]], line_h)
+
+    _cache[key] = layout
+    if len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return layout
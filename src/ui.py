@@ -5,24 +5,62 @@
 """
 
 import pygame
+from .textlayout import layout_text
+
+WINDOW_RECT = (48, 320, 544, 128)
+PADDING = 8
+
+
+def text_area(rect=WINDOW_RECT):
+    """ウィンドウ内で文字を置ける領域の (幅, 高さ)"""
+    return rect[2] - PADDING * 2, rect[3] - PADDING * 2
+
+
+def _draw_frame(surface, rect, bgcolor):
+    pygame.draw.rect(surface, bgcolor, rect)
+    pygame.draw.rect(surface, (200, 200, 200), rect, 2)
 
 
 def draw_window(
     surface,
     font,
     lines,
-    rect=(48, 320, 544, 128),
+    rect=WINDOW_RECT,
     bgcolor=(0, 0, 0),
     fg=(255, 255, 255),
 ):
     """
     画面下部にテキストウィンドウを表示します．
+    各行はウィンドウ幅で折り返し、収まらない場合はウィンドウを下に伸ばして
+    すべての行を描画します．
     rect: (x, y, w, h)
     """
     x, y, w, h = rect
-    pygame.draw.rect(surface, bgcolor, (x, y, w, h))
-    pygame.draw.rect(surface, (200, 200, 200), (x, y, w, h), 2)
+    text_w, text_h = text_area(rect)
+    rows = []
+    for line in lines:
+        layout = layout_text(line, font, text_w, text_h, fg)
+        for page in layout.pages:
+            rows.extend(surf for surf, _ in page)
     line_h = font.get_linesize()
-    for i, line in enumerate(lines):
-        surf = font.render(line, True, fg)
-        surface.blit(surf, (x + 8, y + 8 + i * line_h))
+    h = max(h, len(rows) * line_h + PADDING * 2)
+    _draw_frame(surface, (x, y, w, h), bgcolor)
+    for row, surf in enumerate(rows):
+        surface.blit(surf, (x + PADDING, y + PADDING + row * line_h))
+
+
+def draw_text_window(
+    surface,
+    layout,
+    page,
+    reveal=None,
+    rect=WINDOW_RECT,
+    bgcolor=(0, 0, 0),
+):
+    """
+    レイアウト済みテキストの page 番目のページをウィンドウに表示します．
+    reveal: タイプライター表示で見せる文字数 (None なら全文)
+    """
+    x, y, _, _ = rect
+    _draw_frame(surface, rect, bgcolor)
+    layout.draw(surface, (x + PADDING, y + PADDING), page, reveal)
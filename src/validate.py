@@ -0,0 +1,316 @@
+"""
+コンテンツ検証 | validate.py
+
+maps.json と dialogues.json を読み込み、参照の整合性と到達可能性を検査する
+- 出口の target_map が存在するか、dest_x / dest_y が遷移先の範囲内・壁以外か
+- NPC の map_id が存在するか、NPC が範囲内・壁以外にいるか、クイズの answer が範囲内か
+- スタート地点から各マップの出口をたどって到達できないマップ・NPC がないか
+マップごとの検査 (画像サイズ取得・連結成分の計算) はプロセスプールで並列に行う
+
+実行方法: python -m src.validate
+エラーがあれば終了コード 1 を返す
+"""
+
+import argparse
+import os
+import struct
+import sys
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from .utils import load_json
+from .core.models import TRANSITION_KINDS, MapData, load_npcs
+
+TILE = 16
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "assets"))
+
+# app.py のプレイヤー初期位置
+SPAWN = ("world", 8, 8)
+
+
+def image_size(path):
+    """
+    画像全体をデコードせず、ヘッダから (幅, 高さ) を読む
+    PNG / JPEG 以外は pygame で読み込む
+    """
+    with open(path, "rb") as f:
+        head = f.read(24)
+        if head[:8] == b"\x89PNG\r\n\x1a\n":
+            return struct.unpack(">II", head[16:24])
+        if head[:2] == b"\xff\xd8":
+            f.seek(2)
+            while True:
+                marker = f.read(2)
+                if len(marker) < 2 or marker[0] != 0xFF:
+                    break
+                length = struct.unpack(">H", f.read(2))[0]
+                # SOF0〜SOF15 (DHT, JPG, DAC を除く) に画像サイズがある
+                if 0xC0 <= marker[1] <= 0xCF and marker[1] not in (0xC4, 0xC8, 0xCC):
+                    h, w = struct.unpack(">xHH", f.read(5))
+                    return w, h
+                f.seek(length - 2, os.SEEK_CUR)
+
+    import pygame
+
+    return pygame.image.load(path).get_size()
+
+
+def _label_components(w, h, blocked):
+    """
+    通行可能なタイルを 4 近傍で連結成分に分け、タイルごとの成分番号を返す
+    通行不可のタイルは -1
+    """
+    labels = array("i", [-1]) * (w * h)
+    comp = 0
+    for start in range(w * h):
+        if blocked[start] or labels[start] != -1:
+            continue
+        labels[start] = comp
+        queue = deque([start])
+        while queue:
+            i = queue.popleft()
+            x = i % w
+            for j in (i - w, i + w, i - 1 if x > 0 else -1, i + 1 if x < w - 1 else -1):
+                if 0 <= j < w * h and not blocked[j] and labels[j] == -1:
+                    labels[j] = comp
+                    queue.append(j)
+        comp += 1
+    return labels
+
+
+def _describe_source(src):
+    """到着元をメッセージ用の文字列にする"""
+    if src is None:
+        return "スタート地点"
+    src_map, ex_x, ex_y = src
+    return f"{src_map} の出口 ({ex_x}, {ex_y}) から"
+
+
+def check_map(job):
+    """
+    マップ 1 枚分の検査 (プロセスプールのワーカーで実行)
+    job: (map_id, maps.json の dict, 画像ディレクトリ, このマップの NPC 座標,
+          このマップへの到着地点 {(x, y): [到着元, ...]})
+      到着元は (遷移元マップ, 出口 x, 出口 y)、スタート地点は None
+    戻り値: {"errors", "warnings", "exits", "entries", "npcs"}
+      exits:   [(出口番号, 出口に入れる成分の集合), ...]
+      entries: {(x, y): 到着後にいる成分の集合}
+      npcs:    {npc_id: 話しかけられる成分の集合}
+    """
+    map_id, raw, img_dir, npcs, entries = job
+    data = MapData.from_dict(map_id, raw)
+    errors, warnings = [], []
+    result = {"errors": errors, "warnings": warnings, "exits": [], "entries": {}}
+    result["npcs"] = {}
+
+    path = os.path.join(img_dir, data.image)
+    if not os.path.isfile(path):
+        errors.append(f"[{map_id}] 画像がありません: {data.image}")
+        return result
+    try:
+        px_w, px_h = image_size(path)
+    except Exception as e:
+        errors.append(f"[{map_id}] 画像を読み込めません: {data.image} ({e})")
+        return result
+    w, h = px_w // TILE, px_h // TILE
+
+    def inside(x, y):
+        return isinstance(x, int) and isinstance(y, int) and 0 <= x < w and 0 <= y < h
+
+    # 通行不可: 壁・NPC・出口 (出口に入ると遷移するのでその先へは歩けない)
+    blocked = bytearray(w * h)
+    # 壁は pack_pos 済みの値ではなく maps.json の座標そのものを見る
+    for x, y in raw.get("walls", []):
+        if inside(x, y):
+            blocked[y * w + x] = 1
+        else:
+            warnings.append(f"[{map_id}] 壁 ({x}, {y}) がマップ外です")
+
+    transitions = [t for t in data.triggers if t.kind in TRANSITION_KINDS]
+    for t in transitions:
+        for y in range(t.y, t.y + t.h):
+            for x in range(t.x, t.x + t.w):
+                if inside(x, y):
+                    blocked[y * w + x] = 1
+
+    for npc_id, x, y in npcs:
+        if not inside(x, y):
+            errors.append(f"[{map_id}] NPC {npc_id} ({x}, {y}) がマップ外です")
+        elif data.is_wall(x, y):
+            errors.append(f"[{map_id}] NPC {npc_id} ({x}, {y}) が壁の上にいます")
+        else:
+            blocked[y * w + x] = 1
+
+    labels = _label_components(w, h, blocked)
+
+    def comps_around(x, y):
+        """タイルの上下左右の通行可能タイルが属する成分"""
+        found = set()
+        for nx, ny in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)):
+            if inside(nx, ny) and labels[ny * w + nx] != -1:
+                found.add(labels[ny * w + nx])
+        return found
+
+    for i, t in enumerate(transitions):
+        comps = set()
+        for y in range(t.y, t.y + t.h):
+            for x in range(t.x, t.x + t.w):
+                if inside(x, y):
+                    comps |= comps_around(x, y)
+        if not (inside(t.x, t.y) and inside(t.x + t.w - 1, t.y + t.h - 1)):
+            errors.append(f"[{map_id}] 出口 ({t.x}, {t.y}) がマップ外です")
+        result["exits"].append((i, comps))
+
+    for (x, y), sources in entries.items():
+        where = ", ".join(_describe_source(src) for src in sources)
+        if not inside(x, y):
+            errors.append(f"[{map_id}] 到着地点 ({x}, {y}) がマップ外です ({where})")
+            continue
+        if data.is_wall(x, y):
+            errors.append(f"[{map_id}] 到着地点 ({x}, {y}) が壁の上です ({where})")
+            continue
+        label = labels[y * w + x]
+        result["entries"][(x, y)] = {label} if label != -1 else comps_around(x, y)
+
+    for npc_id, x, y in npcs:
+        if inside(x, y):
+            result["npcs"][npc_id] = comps_around(x, y)
+    return result
+
+
+def validate(maps_raw, dialogues_raw, img_dir, spawn=SPAWN, jobs=None):
+    """
+    全マップ・全 NPC を検査して (エラーのリスト, 警告のリスト) を返す
+    """
+    errors, warnings = [], []
+    maps = {}
+    for map_id, d in maps_raw.items():
+        try:
+            maps[map_id] = MapData.from_dict(map_id, d)
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            errors.append(f"[{map_id}] マップデータを読み込めません: {e!r}")
+    npcs = load_npcs(dialogues_raw)
+
+    # --- 参照の整合性 ---
+    # entries: {map_id: {(x, y): [到着元, ...]}}
+    spawn_map, spawn_x, spawn_y = spawn
+    entries = {map_id: {} for map_id in maps}
+    if spawn_map in maps:
+        entries[spawn_map][(spawn_x, spawn_y)] = [None]
+    elif spawn_map not in maps_raw:
+        errors.append(f"スタート地点のマップがありません: {spawn_map}")
+
+    for map_id, data in maps.items():
+        for t in data.triggers:
+            if t.kind not in TRANSITION_KINDS:
+                continue
+            ex = t.data
+            if ex.target_map not in maps_raw:
+                errors.append(
+                    f"[{map_id}] 出口 ({t.x}, {t.y}) の遷移先がありません: {ex.target_map}"
+                )
+            elif ex.dest_x is None or ex.dest_y is None:
+                errors.append(
+                    f"[{map_id}] 出口 ({t.x}, {t.y}) に dest_x / dest_y がありません"
+                )
+            elif ex.target_map in maps:
+                dest = (ex.dest_x, ex.dest_y)
+                entries[ex.target_map].setdefault(dest, []).append((map_id, t.x, t.y))
+
+    npcs_by_map = {map_id: [] for map_id in maps}
+    for npc in npcs.values():
+        if npc.map_id not in maps_raw:
+            errors.append(f"NPC {npc.npc_id} のマップがありません: {npc.map_id}")
+        elif npc.x is None:
+            errors.append(f"NPC {npc.npc_id} に position がありません")
+        elif npc.map_id in maps:
+            npcs_by_map[npc.map_id].append((npc.npc_id, npc.x, npc.y))
+        q = npc.quiz
+        if q and not (isinstance(q.answer, int) and 0 <= q.answer < len(q.choices)):
+            errors.append(
+                f"NPC {npc.npc_id} のクイズの answer {q.answer} が choices の範囲外です"
+            )
+
+    # --- マップごとの検査 (並列) ---
+    job_list = [
+        (map_id, maps_raw[map_id], img_dir, npcs_by_map[map_id], entries[map_id])
+        for map_id in maps
+    ]
+    if jobs == 1 or len(job_list) <= 1:
+        results = list(map(check_map, job_list))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(check_map, job_list, chunksize=4))
+    results = dict(zip(maps, results))
+    for r in results.values():
+        errors.extend(r["errors"])
+        warnings.extend(r["warnings"])
+
+    # --- 到達可能性: (マップ, 連結成分) を頂点として出口をたどる ---
+    if spawn_map not in maps:
+        return errors, warnings
+    start = results[spawn_map]["entries"].get((spawn_x, spawn_y), set())
+    seen = {(spawn_map, c) for c in start}
+    queue = deque(seen)
+    while queue:
+        map_id, comp = queue.popleft()
+        transitions = [t for t in maps[map_id].triggers if t.kind in TRANSITION_KINDS]
+        for i, comps in results[map_id]["exits"]:
+            ex = transitions[i].data
+            if comp not in comps or ex.target_map not in maps:
+                continue
+            dest = (ex.dest_x, ex.dest_y)
+            for c in results[ex.target_map]["entries"].get(dest, ()):
+                if (ex.target_map, c) not in seen:
+                    seen.add((ex.target_map, c))
+                    queue.append((ex.target_map, c))
+
+    reached_maps = {map_id for map_id, _ in seen}
+    for map_id in maps:
+        if map_id not in reached_maps:
+            warnings.append(f"[{map_id}] スタート地点から到達できません")
+    for map_id, r in results.items():
+        for npc_id, comps in r["npcs"].items():
+            if not any((map_id, c) in seen for c in comps):
+                warnings.append(f"[{map_id}] NPC {npc_id} に話しかけられません")
+    return errors, warnings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="maps.json / dialogues.json の検証")
+    parser.add_argument("--maps", default=os.path.join(BASE_DIR, "data", "maps.json"))
+    parser.add_argument(
+        "--dialogues", default=os.path.join(BASE_DIR, "dialogues", "dialogues.json")
+    )
+    parser.add_argument("--img-dir", default=os.path.join(BASE_DIR, "img"))
+    parser.add_argument(
+        "--spawn",
+        nargs=3,
+        metavar=("MAP_ID", "X", "Y"),
+        default=SPAWN,
+        help="スタート地点 (既定: world 8 8)",
+    )
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="並列数")
+    args = parser.parse_args(argv)
+
+    maps_raw = load_json(args.maps)
+    if maps_raw is None:
+        print("maps.json がありません:", args.maps)
+        return 1
+    dialogues_raw = load_json(args.dialogues) or {}
+    spawn = (args.spawn[0], int(args.spawn[1]), int(args.spawn[2]))
+
+    errors, warnings = validate(maps_raw, dialogues_raw, args.img_dir, spawn, args.jobs)
+    for w in warnings:
+        print("WARNING:", w)
+    for e in errors:
+        print("ERROR:", e)
+    print(
+        f"{len(maps_raw)} maps, {len(dialogues_raw)} NPCs: "
+        f"{len(errors)} errors, {len(warnings)} warnings"
+    )
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())